@@ -1,360 +1,176 @@
 import sys
 import os
+import gc
+import functools
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import NamedTuple
 from pathlib import Path
 from PyQt6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-    QPushButton, QListWidget, QListWidgetItem, QFileDialog, QMessageBox, QLabel, 
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
+    QPushButton, QListView, QFileDialog, QMessageBox, QLabel,
     QSpinBox, QGroupBox, QProgressBar, QTextEdit, QSplitter, QCheckBox, QSlider, QComboBox, QGridLayout
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QPixmap, QIcon
-from PIL import Image
+from PyQt6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QPixmap, QIcon, QImage, QImageReader, QStandardItemModel, QStandardItem, QTextCursor
 
 
+@functools.lru_cache(maxsize=None)
+def _worker_cls():
+    """Import the processing engine on first use.
+
+    gif_worker pulls in PIL, NumPy and the optional accelerators -
+    hundreds of ms the window shouldn't wait for at startup. The cache
+    makes every call after the first a plain lookup.
+    """
+    from gif_worker import EnhancedGifCreatorThread
+    return EnhancedGifCreatorThread
+
+
+class ImageListModel(QStandardItemModel):
+    """List model that renders the "1. filename" numbering at display time
+
+    The filename lives in UserRole; the numbered label is produced per
+    paint from the row index, so a reorder never rewrites any item text.
+    """
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole:
+            name = super().data(index, Qt.ItemDataRole.UserRole)
+            return f"{index.row() + 1}. {name}"
+        return super().data(index, role)
+
+
+class DragDropListWidget(QListView):
+    """Custom list view with drag and drop reordering capability"""
 
-class DragDropListWidget(QListWidget):
-    """Custom list widget with drag and drop reordering capability"""
-    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setDragDropMode(QListWidget.DragDropMode.InternalMove)
+        # Keep our own reference to the app window: once the layout
+        # adopts this widget, parent() is the enclosing QGroupBox, not
+        # the GifMakerApp that owns image_paths
+        self._owner = parent
+        self.setModel(ImageListModel(self))
+        self.setDragDropMode(QListView.DragDropMode.InternalMove)
         self.setDefaultDropAction(Qt.DropAction.MoveAction)
-    
-    def dropEvent(self, event):
-        # Get the item being dragged
-        source_row = self.currentRow()
-        
-        # Call parent's drop event to handle the move
-        super().dropEvent(event)
-        
-        # Get the new position
-        target_row = self.currentRow()
-        
-        # Update the parent's image_paths list to match the new order
-        if hasattr(self.parent(), 'reorder_images'):
-            self.parent().reorder_images(source_row, target_row)
-
 
-class EnhancedGifCreatorThread(QThread):
-    """Enhanced thread with quality and crop options"""
-    progress = pyqtSignal(int)
-    finished = pyqtSignal(str)
-    error = pyqtSignal(str)
-
-    def __init__(self, image_paths, output_path, fade_steps, hold_duration, fade_duration,
-             preserve_quality=False, quality=95, resampling_method="LANCZOS (Best)",
-             crop_area=None, dither_method="Floyd-Steinberg (Best)", sharpen_strength=0,
-             quantization_method="Median Cut (Best)"):
-        super().__init__()
-        self.image_paths = image_paths
-        self.output_path = output_path
-        self.fade_steps = fade_steps
-        self.hold_duration = hold_duration
-        self.fade_duration = fade_duration
-        self.preserve_quality = preserve_quality
-        self.quality = quality
-        self.resampling_method = resampling_method
-        self.crop_area = crop_area
-        self.dither_method = dither_method
-        self.sharpen_strength = sharpen_strength
-        self.quantization_method = quantization_method
+    def add_item(self, filename):
+        item = QStandardItem()
+        item.setData(filename, Qt.ItemDataRole.UserRole)
+        item.setEditable(False)
+        # Drops land between rows, never onto an item
+        item.setDropEnabled(False)
+        self.model().appendRow(item)
 
-    def run(self):
-        try:
-            creator = GifFadeCreator()
-            creator.progress_callback = self.progress.emit
-            target_size = None if self.preserve_quality else (1920, 1080)
-            
-            creator.create_fade_gif(
-                self.image_paths,
-                self.output_path,
-                fade_steps=self.fade_steps,
-                hold_duration=self.hold_duration,
-                fade_duration=self.fade_duration,
-                target_size=target_size,
-                preserve_quality=self.preserve_quality,
-                quality=self.quality,
-                resampling_method=self.resampling_method,
-                crop_area=self.crop_area,
-                dither_method=self.dither_method,
-                sharpen_strength=self.sharpen_strength,
-                quantization_method=self.quantization_method
-            )
-            
-            self.finished.emit(self.output_path)
-        except Exception as e:
-            self.error.emit(str(e))
+    def current_row(self):
+        return self.currentIndex().row()
 
+    def remove_row(self, row):
+        self.model().removeRow(row)
 
+    def clear(self):
+        self.model().clear()
 
-class GifFadeCreator:
-    def __init__(self):
-        self.progress_callback = None
-    
-    def get_resampling_filter(self, method_name):
-        """Get PIL resampling filter from method name"""
-        filters = {
-            "LANCZOS (Best)": Image.Resampling.LANCZOS,
-            "BICUBIC": Image.Resampling.BICUBIC,
-            "BILINEAR": Image.Resampling.BILINEAR,
-            "NEAREST": Image.Resampling.NEAREST
-        }
-        return filters.get(method_name, Image.Resampling.LANCZOS)
-
-    def get_quantization_method(self, method_name):
-        """Get PIL quantization method from method name"""
-        methods = {
-            "Median Cut (Best)": Image.Quantize.MEDIANCUT,
-            "Maximum Coverage": Image.Quantize.MAXCOVERAGE,
-            "Fast Octree": Image.Quantize.FASTOCTREE
-        }
-        return methods.get(method_name, Image.Quantize.MEDIANCUT)
+    def count(self):
+        return self.model().rowCount()
 
-    
-    def resize_images_to_match(self, images, target_size=None, preserve_quality=False, resampling_filter=Image.Resampling.LANCZOS):
-        """Enhanced resize with quality preservation options"""
-        if preserve_quality:
-            # Find the largest dimensions among all images
-            max_width = max(img.size[0] for img in images)
-            max_height = max(img.size[1] for img in images)
-            target_size = (max_width, max_height)
-        elif target_size is None:
-            target_size = (1920, 1080)
-
-        target_width, target_height = target_size
-        resized_images = []
-
-        for img in images:
-            if preserve_quality and img.size == target_size:
-                # No resize needed, keep original
-                if img.mode != 'RGBA':
-                    img = img.convert('RGBA')
-                resized_images.append(img)
-                continue
+    def dropEvent(self, event):
+        source_row = self.currentIndex().row()
+        if source_row < 0:
+            event.ignore()
+            return
 
-            # Calculate scaling
-            img_width, img_height = img.size
-            width_ratio = target_width / img_width
-            height_ratio = target_height / img_height
-            scale_ratio = min(width_ratio, height_ratio)
+        model = self.model()
+        pos = event.position().toPoint()
+        index = self.indexAt(pos)
+        if not index.isValid():
+            # Dropped on the empty area below the rows: append
+            insert_at = model.rowCount()
+        else:
+            # The drop indicator is drawn above or below the hovered row
+            # depending on which half of its rect the cursor is in; the
+            # insert slot has to match what the indicator shows
+            insert_at = index.row()
+            if pos.y() >= self.visualRect(index).center().y():
+                insert_at += 1
+
+        # Taking the source row shifts every later slot up by one
+        target_row = insert_at - 1 if insert_at > source_row else insert_at
+        if target_row == source_row:
+            event.ignore()
+            return
 
-            new_width = int(img_width * scale_ratio)
-            new_height = int(img_height * scale_ratio)
+        # QStandardItemModel has no moveRows; take + insert moves the
+        # one item without touching any other row's data
+        model.insertRow(target_row, model.takeRow(source_row))
+        self.setCurrentIndex(model.index(target_row, 0))
+        event.accept()
 
-            # Use multi-stage resize for better quality
-            img_resized = self.multi_stage_resize(img, (new_width, new_height), resampling_filter)
+        # Update the owner's image_paths list to match the new order
+        if self._owner is not None:
+            self._owner.reorder_images(source_row, target_row)
 
-            # Create canvas
-            canvas = Image.new('RGBA', target_size, (0, 0, 0, 0))
-            x_offset = (target_width - new_width) // 2
-            y_offset = (target_height - new_height) // 2
-            canvas.paste(img_resized, (x_offset, y_offset))
 
-            resized_images.append(canvas)
+class PreviewTaskSignals(QObject):
+    """Signal holder - QRunnable itself cannot carry signals"""
+    done = pyqtSignal(int, str, QImage)
 
-        return resized_images
 
+class PreviewTask(QRunnable):
+    """Decode one preview image at reduced size off the GUI thread
 
-    def create_fade_transition(self, image1, image2, fade_steps=10):
-        """Create fade transition frames between two images"""
-        frames = []
-        img1 = image1.convert('RGBA')
-        img2 = image2.convert('RGBA')
+    Emits a QImage, not a QPixmap: pixmaps may only be created on the
+    GUI thread, so the slot does the final conversion.
+    """
 
-        for i in range(fade_steps):
-            alpha = i / (fade_steps - 1) if fade_steps > 1 else 1
-            blended = Image.blend(img1, img2, alpha)
-            frames.append(blended)
+    def __init__(self, generation, path):
+        super().__init__()
+        self.generation = generation
+        self.path = path
+        self.signals = PreviewTaskSignals()
 
-        return frames
-    
-    def create_fade_gif(self, image_paths, output_path, fade_steps=15, hold_duration=500,
-                   fade_duration=50, loop=0, target_size=None, preserve_quality=False,
-                   quality=95, resampling_method="LANCZOS (Best)", crop_area=None,
-                   dither_method="Floyd-Steinberg (Best)", sharpen_strength=0, 
-                   quantization_method="Median Cut (Best)"):
-
-        """Enhanced GIF creation with quality and crop options"""
-        
-        # Load images
-        images = []
-        total_steps = len(image_paths) * 2
-        current_step = 0
-
-        for path in image_paths:
-            if os.path.exists(path):
-                img = Image.open(path).convert('RGBA')
-                
-                # Apply color space preservation
-                img = self.preserve_color_space(img)
-                
-                # Apply cropping if specified
-                if crop_area:
-                    img = self.crop_image(img, crop_area)
-                
-                # Apply sharpening if enabled
-                if sharpen_strength > 0:
-                    img = self.apply_sharpening(img, sharpen_strength)
-                
-                images.append(img)
-                current_step += 1
-                if self.progress_callback:
-                    self.progress_callback(int((current_step / total_steps) * 50))
-
-        if len(images) < 2:
-            raise ValueError("Need at least 2 images to create transitions")
-
-        # Resize images with quality settings
-        resampling_filter = self.get_resampling_filter(resampling_method)
-        images = self.resize_images_to_match(images, target_size, preserve_quality, resampling_filter)
-
-        # Create frames with fade transitions
-        all_frames = []
-        durations = []
-
-        for i in range(len(images)):
-            all_frames.append(images[i])
-            durations.append(hold_duration)
-
-            if i < len(images) - 1:
-                fade_frames = self.create_fade_transition(images[i], images[i + 1], fade_steps)
-                all_frames.extend(fade_frames)
-                durations.extend([fade_duration] * len(fade_frames))
-
-            current_step += 1
-            if self.progress_callback:
-                self.progress_callback(int(50 + (current_step / len(images)) * 50))
-
-        # Use enhanced quantization
-        dither_filter = self.get_dither_method(dither_method)
-        quantize_filter = self.get_quantization_method(quantization_method)
-        rgb_frames = self.enhanced_quantization(all_frames, preserve_quality, dither_filter, quantize_filter)
-
-
-        # Save GIF with custom quality
-        rgb_frames[0].save(
-            output_path,
-            save_all=True,
-            append_images=rgb_frames[1:],
-            duration=durations,
-            loop=loop,
-            disposal=2,
-            optimize=quality < 90,  # Only optimize for lower quality
-            quality=quality,
-            method=6
-        )
+    def run(self):
+        # Decode straight to preview size: setScaledSize makes the codec
+        # itself produce the thumbnail (libjpeg DCT scaling, libpng
+        # scaled read), so the bytes decoded shrink with the target area
+        reader = QImageReader(self.path)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        size.scale(280, 280, Qt.AspectRatioMode.KeepAspectRatio)
+        reader.setScaledSize(size)
+        self.signals.done.emit(self.generation, self.path, reader.read())
+
+
+class CropBox(NamedTuple):
+    """Crop rectangle in pixels; a plain tuple to PIL's crop()"""
+    left: int
+    top: int
+    right: int
+    bottom: int
+
+
+@dataclass
+class GifJob:
+    """Everything one GIF render needs, read off the widgets in one go"""
+    image_paths: list
+    output_path: str
+    fade_steps: int
+    hold_duration: int
+    fade_duration: int
+    preserve_quality: bool = False
+    quality: int = 95
+    resampling_method: str = "LANCZOS (Best)"
+    crop_area: tuple = None
+    dither_method: str = "Floyd-Steinberg (Best)"
+    sharpen_strength: float = 0
+    quantization_method: str = "Median Cut (Best)"
 
-    
-    def crop_image(self, img, crop_area):
-        """Crop image to specified area (left, top, right, bottom)"""
-        return img.crop(crop_area)
-
-    def get_dither_method(self, method_name):
-        """Get PIL dithering method"""
-        methods = {
-            "Floyd-Steinberg (Best)": Image.Dither.FLOYDSTEINBERG,
-            "Ordered": Image.Dither.ORDERED,
-            "None (Faster)": Image.Dither.NONE
-        }
-        return methods.get(method_name, Image.Dither.FLOYDSTEINBERG)
-
-    def enhanced_quantization(self, frames, preserve_quality=False, dither_method=Image.Dither.FLOYDSTEINBERG, quantize_method=Image.Quantize.MEDIANCUT):
-        """Enhanced color quantization for better quality"""
-        if preserve_quality:
-            # Use adaptive palette for each frame
-            quantized_frames = []
-            for frame in frames:
-                # Convert RGBA to RGB with white background
-                if frame.mode == 'RGBA':
-                    background = Image.new('RGB', frame.size, (255, 255, 255))
-                    background.paste(frame, mask=frame.split()[-1])
-                    frame = background
-                
-                # Use adaptive quantization with maximum colors and selected method
-                quantized = frame.quantize(colors=256, method=quantize_method, dither=dither_method)
-                quantized_frames.append(quantized.convert('RGB'))
-            return quantized_frames
-        else:
-            # Convert all frames first
-            rgb_frames = []
-            for frame in frames:
-                if frame.mode == 'RGBA':
-                    background = Image.new('RGB', frame.size, (255, 255, 255))
-                    background.paste(frame, mask=frame.split()[-1])
-                    frame = background
-                rgb_frames.append(frame)
-            return rgb_frames
-
-
-    def multi_stage_resize(self, img, target_size, resampling_filter):
-        """Multi-stage resizing for better quality when downscaling significantly"""
-        current_size = img.size
-        target_width, target_height = target_size
-        
-        # Calculate if we need multi-stage resizing (when downscaling > 50%)
-        scale_x = target_width / current_size[0]
-        scale_y = target_height / current_size[1]
-        min_scale = min(scale_x, scale_y)
-        
-        if min_scale < 0.5:  # Significant downscaling
-            # Use multiple stages
-            current_img = img
-            while True:
-                current_w, current_h = current_img.size
-                next_scale = max(min_scale * 2, 0.5)  # Don't go below 50% per stage
-                
-                if next_scale >= 1.0:
-                    break
-                    
-                new_w = int(current_w * next_scale)
-                new_h = int(current_h * next_scale)
-                current_img = current_img.resize((new_w, new_h), resampling_filter)
-                
-                if new_w <= target_width and new_h <= target_height:
-                    break
-            
-            # Final resize to exact target
-            return current_img.resize(target_size, resampling_filter)
-        else:
-            # Single-stage resize
-            return img.resize(target_size, resampling_filter)
-
-    def apply_sharpening(self, img, strength=1.0):
-        """Apply unsharp mask for crisper images"""
-        from PIL import ImageFilter
-        
-        if strength == 0:
-            return img
-        
-        # Apply unsharp mask
-        sharpened = img.filter(ImageFilter.UnsharpMask(
-            radius=1.0 * strength,
-            percent=int(100 * strength),
-            threshold=3
-        ))
-        return sharpened
-
-    def preserve_color_space(self, img):
-        """Preserve original color space information"""
-        # Check if image has color profile
-        if hasattr(img, 'info') and 'icc_profile' in img.info:
-            # Preserve ICC profile
-            profile = img.info['icc_profile']
-            # Apply profile-aware conversion if needed
-            try:
-                from PIL import ImageCms
-                import io
-                profile_obj = ImageCms.ImageCmsProfile(io.BytesIO(profile))
-                # Convert to sRGB for web display while preserving quality
-                img = ImageCms.profileToProfile(img, profile_obj, 
-                                              ImageCms.createProfile('sRGB'))
-            except:
-                pass  # Fall back to standard conversion
-        
-        return img
 
 
 class GifMakerApp(QMainWindow):
+    # At 280px a pixmap is ~300 KB, so 64 entries cost a few MB
+    _PREVIEW_CACHE_LIMIT = 64
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle('GIF Maker with Fade Effects')
@@ -634,6 +450,15 @@ class GifMakerApp(QMainWindow):
         self.log_text = QTextEdit()
         self.log_text.setMaximumHeight(150)
         self.log_text.setReadOnly(True)
+        # Cap the backlog so long runs don't grow the document (and its
+        # layout passes) without bound
+        self.log_text.document().setMaximumBlockCount(500)
+        # Batch log lines and flush at 10 Hz: one layout pass and one
+        # scroll per flush, however fast the worker produces messages
+        self._log_queue = []
+        self._log_timer = QTimer(self)
+        self._log_timer.timeout.connect(self._flush_log)
+        self._log_timer.start(100)
         log_layout.addWidget(self.log_text)
         
         right_layout.addWidget(log_group)
@@ -648,10 +473,42 @@ class GifMakerApp(QMainWindow):
         main_layout.addWidget(splitter)
         
         # Connect list selection to preview
-        self.image_list_widget.itemSelectionChanged.connect(self.update_preview)
+        self.image_list_widget.selectionModel().currentRowChanged.connect(self.update_preview)
         
         # Store image paths
         self.image_paths = []
+        # Maintained alongside image_paths by every mutation so button
+        # state updates never re-measure the list
+        self._path_count = 0
+        # Existing, supported-suffix subset of image_paths, rebuilt in
+        # one pass after every list change so nothing downstream has to
+        # re-stat files; this is what gets handed to the worker
+        self._resolved_paths = []
+
+        # Scaled preview pixmaps keyed by path, LRU-evicted; repeat
+        # visits in the list become a dict lookup instead of a decode
+        self._preview_cache = OrderedDict()
+
+        # Previews decode on a small pool so list scrolling never blocks
+        # on image I/O; the generation counter drops results that arrive
+        # after the selection has already moved on. Two threads at most,
+        # so previews don't steal cores from a running GIF job.
+        self._preview_generation = 0
+        self._preview_pool = QThreadPool(self)
+        self._preview_pool.setMaxThreadCount(2)
+
+        # The worker's progress signal only stores the latest value;
+        # this timer repaints the bar at ~30 Hz while a job runs, so the
+        # paint rate is bounded regardless of how fast the worker emits
+        self._pending_progress = 0
+        self._progress_timer = QTimer(self)
+        self._progress_timer.timeout.connect(self._apply_progress)
+
+        # One persistent worker serves every Generate click; signals are
+        # connected once here instead of per job
+        # Created lazily on the first Generate click so the processing
+        # engine (PIL, NumPy, accelerators) isn't imported at startup
+        self.worker_thread = None
         
         self.log("Application started. Ready to create GIFs!")
         self.log("💡 Use 'Add Images' to select multiple files at once")
@@ -666,52 +523,56 @@ class GifMakerApp(QMainWindow):
         )
         
         if file_paths:
-            added_count = 0
+            # Duplicates are allowed on purpose: repeating an image
+            # (e.g. A B A, or the same still twice for a longer dwell)
+            # is a legitimate sequence; only consecutive repeats are
+            # collapsed when the job is built
             for file_path in file_paths:
-                if file_path not in self.image_paths:  # Avoid duplicates
-                    self.image_paths.append(file_path)
-                    filename = Path(file_path).name
-                    self.image_list_widget.addItem(f"{len(self.image_paths)}. {filename}")
-                    added_count += 1
-            
-            if added_count > 0:
-                self.log(f"Added {added_count} images")
-                self.update_button_states()
-            else:
-                self.log("No new images added (duplicates filtered)")
+                self.image_paths.append(file_path)
+                filename = Path(file_path).name
+                self.image_list_widget.add_item(filename)
+
+            self._path_count += len(file_paths)
+            self._refresh_paths()
+            # Decode thumbnails during user think-time so the first
+            # click on each item is a cache hit
+            self._warm_preview_cache(file_paths)
+            self.log(f"Added {len(file_paths)} images")
+            self.update_button_states()
     
     
 
     def reorder_images(self, source_row, target_row):
         """Reorder images in the internal list to match the UI"""
         if 0 <= source_row < len(self.image_paths) and 0 <= target_row < len(self.image_paths):
-            # Move the item in the image_paths list
+            # Move the item in the image_paths list; the view's model
+            # moved already, and the numbering is rendered per paint,
+            # so no item text needs rewriting
             moved_path = self.image_paths.pop(source_row)
             self.image_paths.insert(target_row, moved_path)
-            
-            # Update all item texts to reflect new numbering
-            self.refresh_list_numbering()
-            
+
+            self._refresh_paths()
             self.log(f"Reordered: moved item from position {source_row + 1} to {target_row + 1}")
 
-    def refresh_list_numbering(self):
-        """Refresh the numbering in the list widget"""
-        for i in range(self.image_list_widget.count()):
-            item = self.image_list_widget.item(i)
-            if i < len(self.image_paths):
-                filename = Path(self.image_paths[i]).name
-                item.setText(f"{i + 1}. {filename}")
+    _SUPPORTED_SUFFIXES = {'.png', '.jpg', '.jpeg', '.bmp', '.gif', '.tiff'}
+
+    def _refresh_paths(self):
+        """Rebuild the validated path list in a single filesystem pass"""
+        self._resolved_paths = [
+            p for p in map(Path, self.image_paths)
+            if p.suffix.lower() in self._SUPPORTED_SUFFIXES and p.is_file()
+        ]
 
     def remove_image(self):
         """Remove selected image from list"""
-        current_row = self.image_list_widget.currentRow()
+        current_row = self.image_list_widget.current_row()
         if current_row >= 0:
             removed_path = self.image_paths.pop(current_row)
-            self.image_list_widget.takeItem(current_row)
-            
-            # Update numbering for all remaining items
-            self.refresh_list_numbering()
-            
+            self._path_count -= 1
+            self.image_list_widget.remove_row(current_row)
+            self._preview_cache.pop(removed_path, None)
+            self._refresh_paths()
+
             self.log(f"Removed image: {Path(removed_path).name}")
             self.update_button_states()
 
@@ -719,7 +580,10 @@ class GifMakerApp(QMainWindow):
         """Clear all images from list"""
         if self.image_paths:
             self.image_paths.clear()
+            self._path_count = 0
             self.image_list_widget.clear()
+            self._preview_cache.clear()
+            self._resolved_paths = []
             self.preview_label.setText("Select an image to preview")
             self.preview_label.setPixmap(QPixmap())
             self.log("Cleared all images")
@@ -752,58 +616,90 @@ class GifMakerApp(QMainWindow):
 
     def get_crop_area(self):
         """Get current crop area if cropping is enabled"""
-        if self.enable_crop_check.isChecked():
-            return (
-                self.crop_left_spin.value(),
-                self.crop_top_spin.value(),
-                self.crop_right_spin.value(),
-                self.crop_bottom_spin.value()
-            )
-        return None
+        # Short-circuit before any spin-box round-trips when disabled
+        if not self.enable_crop_check.isChecked():
+            return None
+        return CropBox(
+            self.crop_left_spin.value(),
+            self.crop_top_spin.value(),
+            self.crop_right_spin.value(),
+            self.crop_bottom_spin.value()
+        )
 
 
     def update_button_states(self):
         """Update button enabled/disabled states"""
-        has_images = len(self.image_paths) > 0
-        has_multiple = len(self.image_paths) >= 2
-        
-        self.remove_button.setEnabled(has_images)
-        self.clear_button.setEnabled(has_images)
-        self.generate_button.setEnabled(has_multiple)
+        count = self._path_count
+
+        self.remove_button.setEnabled(count > 0)
+        self.clear_button.setEnabled(count > 0)
+        self.generate_button.setEnabled(count >= 2)
 
     def update_preview(self):
         """Update preview when list selection changes"""
-        current_row = self.image_list_widget.currentRow()
+        current_row = self.image_list_widget.current_row()
         if current_row >= 0 and current_row < len(self.image_paths):
-            try:
-                pixmap = QPixmap(self.image_paths[current_row])
-                if not pixmap.isNull():
-                    # Scale pixmap to fit preview area
-                    scaled_pixmap = pixmap.scaled(
-                        280, 280, 
-                        Qt.AspectRatioMode.KeepAspectRatio, 
-                        Qt.TransformationMode.SmoothTransformation
-                    )
-                    self.preview_label.setPixmap(scaled_pixmap)
-                    self.preview_label.setText("")
-                else:
-                    self.preview_label.setText("Could not load image")
-                    self.preview_label.setPixmap(QPixmap())
-            except Exception as e:
-                self.preview_label.setText(f"Error loading image:\n{str(e)}")
-                self.preview_label.setPixmap(QPixmap())
+            path = self.image_paths[current_row]
+            cached = self._preview_cache.get(path)
+            if cached is not None:
+                self._preview_cache.move_to_end(path)
+                self.preview_label.setPixmap(cached)
+                self.preview_label.setText("")
+                return
+            # Decode off the GUI thread; only the newest request wins.
+            # Priority 10 puts clicks ahead of queued eager warm-ups
+            self._preview_generation += 1
+            task = PreviewTask(self._preview_generation, path)
+            task.signals.done.connect(self._on_preview_ready)
+            self._preview_pool.start(task, 10)
+
+    def _warm_preview_cache(self, paths):
+        """Queue low-priority decodes so clicks find the cache warm"""
+        for path in paths:
+            if path in self._preview_cache:
+                continue
+            # Generation -1 never matches a click, so the result only
+            # fills the cache and never paints the label
+            task = PreviewTask(-1, path)
+            task.signals.done.connect(self._on_preview_ready)
+            self._preview_pool.start(task, 0)
+
+    def _on_preview_ready(self, generation, path, image):
+        """Apply a finished preview decode, dropping stale results"""
+        scaled_pixmap = None
+        if not image.isNull():
+            scaled_pixmap = QPixmap.fromImage(image)
+            self._preview_cache[path] = scaled_pixmap
+            while len(self._preview_cache) > self._PREVIEW_CACHE_LIMIT:
+                self._preview_cache.popitem(last=False)
+        if generation != self._preview_generation:
+            # Eager warm-up or a superseded click: cache only
+            return
+        if scaled_pixmap is None:
+            self.preview_label.setText("Could not load image")
+            self.preview_label.setPixmap(QPixmap())
+            return
+        self.preview_label.setPixmap(scaled_pixmap)
+        self.preview_label.setText("")
 
     # Keep all other methods the same (log, generate_gif, on_gif_finished, on_gif_error)
     def log(self, message):
-        """Add message to log area"""
-        self.log_text.append(f"• {message}")
-        self.log_text.verticalScrollBar().setValue(
-            self.log_text.verticalScrollBar().maximum()
-        )
+        """Queue a message for the log area"""
+        self._log_queue.append(message)
+
+    def _flush_log(self):
+        if not self._log_queue:
+            return
+        cursor = self.log_text.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText("".join(f"• {m}\n" for m in self._log_queue))
+        self._log_queue.clear()
+        scrollbar = self.log_text.verticalScrollBar()
+        scrollbar.setValue(scrollbar.maximum())
 
     def generate_gif(self):
         """Generate GIF with enhanced quality and crop options"""
-        if len(self.image_paths) < 2:
+        if self._path_count < 2:
             QMessageBox.warning(
                 self,
                 'Insufficient Images',
@@ -816,26 +712,58 @@ class GifMakerApp(QMainWindow):
             self,
             'Save GIF As',
             'fade_effect.gif',
-            'GIF Files (*.gif);;All Files (*)'
+            'GIF Files (*.gif);;WebP Animation (*.webp);;All Files (*)'
         )
 
         if not output_path:
             return
 
+        # Default to .gif when the user typed a bare name; .webp stays,
+        # it selects the animated-WebP encoder downstream
+        if not output_path.lower().endswith(('.gif', '.webp')):
+            output_path += '.gif'
+
+        # Read every widget before touching any UI state, so an
+        # exception while collecting can't leave the window disabled
+        job = self._collect_params(output_path)
+
         # Disable UI during generation
         self.generate_button.setEnabled(False)
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         self.log("Starting GIF generation with enhanced quality settings...")
-
-        # Get crop area
-        crop_area = self.get_crop_area()
-        if crop_area:
-            self.log(f"Applying crop: {crop_area}")
-
-        # Create and start enhanced worker thread
-        self.worker_thread = EnhancedGifCreatorThread(
-            self.image_paths,
+        if job.crop_area:
+            self.log(f"Applying crop: {tuple(job.crop_area)}")
+
+        if self.worker_thread is None:
+            # First job: import the engine and start the persistent
+            # worker. Explicitly queued connections - these always cross
+            # from the worker thread, so skip auto-connection's per-emit
+            # thread-affinity check.
+            self.worker_thread = _worker_cls()(self)
+            self.worker_thread.progress.connect(
+                self._on_progress, Qt.ConnectionType.QueuedConnection)
+            self.worker_thread.finished.connect(
+                self.on_gif_finished, Qt.ConnectionType.QueuedConnection)
+            self.worker_thread.error.connect(
+                self.on_gif_error, Qt.ConnectionType.QueuedConnection)
+            self.worker_thread.start()
+
+        self._pending_progress = 0
+        self._progress_timer.start(33)
+        self.worker_thread.submit(job)
+
+    def _collect_params(self, output_path):
+        """Batch all the widget reads for one render into a GifJob"""
+        # A still added twice in a row would fade into itself -
+        # fade_steps frames of blending between identical pixels
+        paths = list(self._resolved_paths)
+        deduped = [p for i, p in enumerate(paths) if i == 0 or p != paths[i - 1]]
+        if len(deduped) < len(paths):
+            self.log(f"Skipped {len(paths) - len(deduped)} duplicate consecutive frames")
+
+        return GifJob(
+            deduped,
             output_path,
             self.fade_steps_spin.value(),
             self.hold_duration_spin.value(),
@@ -843,47 +771,69 @@ class GifMakerApp(QMainWindow):
             preserve_quality=self.preserve_quality_check.isChecked(),
             quality=self.quality_slider.value(),
             resampling_method=self.resample_combo.currentText(),
-            crop_area=crop_area,
+            crop_area=self.get_crop_area(),
             dither_method=self.dither_combo.currentText(),
             sharpen_strength=self.sharpen_slider.value() / 10.0,
             quantization_method=self.quantization_combo.currentText()
         )
 
+    def _on_progress(self, value):
+        """Store the latest progress value; the timer paints it"""
+        self._pending_progress = value
 
-
-        self.worker_thread.progress.connect(self.progress_bar.setValue)
-        self.worker_thread.finished.connect(self.on_gif_finished)
-        self.worker_thread.error.connect(self.on_gif_error)
-        self.worker_thread.start()
+    def _apply_progress(self):
+        self.progress_bar.setValue(self._pending_progress)
 
 
     def on_gif_finished(self, output_path):
         """Called when GIF generation is complete"""
-        self.progress_bar.setVisible(False)
-        self.generate_button.setEnabled(True)
-        self.update_button_states()
-        
-        self.log(f"GIF created successfully: {Path(output_path).name}")
-        
-        QMessageBox.information(
-            self, 
-            'Success!', 
-            f'GIF created successfully!\n\nSaved to: {output_path}'
-        )
+        self._progress_timer.stop()
+        # Coalesce the state flips (progress bar, four buttons) into one
+        # repaint instead of a layout pass per widget change
+        self.setUpdatesEnabled(False)
+        try:
+            self.progress_bar.setValue(100)
+            self.progress_bar.setVisible(False)
+            self.generate_button.setEnabled(True)
+            self.update_button_states()
+        finally:
+            self.setUpdatesEnabled(True)
+
+        # A render leaves sizeable garbage behind (frame buffers,
+        # quantization scratch); collect now instead of waiting for the
+        # next threshold-triggered cycle so RSS drops with the job
+        gc.collect()
+
+        # basename is a single C-level rfind; Path() would normalize the
+        # whole string and allocate an object just to read .name
+        name = os.path.basename(output_path)
+        self.log(f"GIF created successfully: {name}")
+        # Status strip instead of a modal dialog: no nested event loop,
+        # and the worker can pick up a queued job immediately
+        self.statusBar().showMessage(f"Saved: {name}", 5000)
 
     def on_gif_error(self, error_message):
         """Called when GIF generation encounters an error"""
-        self.progress_bar.setVisible(False)
-        self.generate_button.setEnabled(True)
-        self.update_button_states()
-        
+        self._progress_timer.stop()
+        self.setUpdatesEnabled(False)
+        try:
+            self.progress_bar.setVisible(False)
+            self.generate_button.setEnabled(True)
+            self.update_button_states()
+        finally:
+            self.setUpdatesEnabled(True)
+
+        gc.collect()
+
         self.log(f"Error: {error_message}")
-        
-        QMessageBox.critical(
-            self, 
-            'Error', 
-            f'Failed to create GIF:\n\n{error_message}'
-        )
+        self.statusBar().showMessage(f"Failed to create GIF: {error_message}", 10000)
+
+    def closeEvent(self, event):
+        """Shut the worker down cleanly before the window goes away"""
+        if self.worker_thread is not None:
+            self.worker_thread.stop()
+            self.worker_thread.wait()
+        super().closeEvent(event)
 
 
 def main():
@@ -0,0 +1,747 @@
+"""Processing engine for the GIF maker: image loading, fade blending,
+quantization and encoding, plus the persistent worker thread.
+
+This module owns every heavy import (PIL, NumPy, the optional numba /
+pyvips / cupy accelerators) so the GUI in GIF.py can start and show its
+window without paying for any of them; it is imported on the first
+Generate click.
+"""
+
+import os
+import io
+import itertools
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from PyQt6.QtCore import QThread, pyqtSignal
+import PIL
+from PIL import Image, ImageCms, ImageFilter, UnidentifiedImageError
+import numpy as np
+
+# Pillow-SIMD is a drop-in replacement for Pillow whose resize/blend
+# paths use SSE4/AVX2; its version strings carry a ".postN" suffix.
+# Nothing needs to change at call sites - this flag just records whether
+# the accelerated build is active (pip install pillow-simd).
+USING_PILLOW_SIMD = 'post' in getattr(PIL, '__version__', '')
+
+try:
+    import numba
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+try:
+    import pyvips
+    HAS_PYVIPS = True
+except ImportError:
+    HAS_PYVIPS = False
+
+try:
+    import cupy
+    HAS_CUDA = True
+except ImportError:
+    HAS_CUDA = False
+
+# Below this frame size the host<->device copies cost more than the
+# GPU blend saves, so small images stay on the CPU paths
+GPU_MIN_PIXELS = 2_000_000
+
+# UI combo-box label -> PIL enum tables; module-level so each lookup is
+# a dict access instead of a fresh dict construction per call
+RESAMPLING_FILTERS = {
+    "LANCZOS (Best)": Image.Resampling.LANCZOS,
+    "BICUBIC": Image.Resampling.BICUBIC,
+    "BILINEAR": Image.Resampling.BILINEAR,
+    "NEAREST": Image.Resampling.NEAREST
+}
+
+QUANTIZATION_METHODS = {
+    "Median Cut (Best)": Image.Quantize.MEDIANCUT,
+    "Maximum Coverage": Image.Quantize.MAXCOVERAGE,
+    "Fast Octree": Image.Quantize.FASTOCTREE
+}
+
+DITHER_METHODS = {
+    "Floyd-Steinberg (Best)": Image.Dither.FLOYDSTEINBERG,
+    "Ordered": Image.Dither.ORDERED,
+    "None (Faster)": Image.Dither.NONE
+}
+
+
+if HAS_NUMBA:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def blend_series(a1, a2, out, alphas):
+        """Write all fade frames between a1 and a2 into out in one pass.
+
+        alphas holds 8.8 fixed-point blend factors (0..256), one per frame.
+        Rows are processed in tiles: each source panel is pushed through
+        every fade step while it is still hot in L1/L2, instead of
+        re-reading the whole image cold for every frame.
+        """
+        height, width, channels = a1.shape
+        tile = 64
+        n_tiles = (height + tile - 1) // tile
+        for t in numba.prange(n_tiles):
+            y0 = t * tile
+            y1 = min(y0 + tile, height)
+            for k in range(alphas.shape[0]):
+                alpha = alphas[k]
+                for y in range(y0, y1):
+                    for x in range(width):
+                        for c in range(channels):
+                            base = np.int32(a1[y, x, c])
+                            delta = np.int32(a2[y, x, c]) - base
+                            out[k, y, x, c] = np.uint8(base + ((delta * alpha) >> 8))
+
+    # nogil lets the quantization thread pool run one dither per core;
+    # the kernel only touches NumPy buffers, never Python objects
+    @numba.njit(nogil=True, cache=True)
+    def fs_dither(rgb, palette, lut):
+        """Serpentine Floyd-Steinberg error diffusion onto a fixed palette.
+
+        rgb is uint8[H,W,3]; palette is int16[256,3]; lut maps 5-bit RGB
+        bins to nearest palette indices. Returns uint8[H,W] indices.
+        """
+        height, width = rgb.shape[0], rgb.shape[1]
+        work = rgb.astype(np.int16)
+        out = np.empty((height, width), dtype=np.uint8)
+        for y in range(height):
+            step = 1 if y % 2 == 0 else -1
+            x = 0 if step == 1 else width - 1
+            for _ in range(width):
+                r = min(max(np.int32(work[y, x, 0]), 0), 255)
+                g = min(max(np.int32(work[y, x, 1]), 0), 255)
+                b = min(max(np.int32(work[y, x, 2]), 0), 255)
+                idx = lut[r >> 3, g >> 3, b >> 3]
+                out[y, x] = idx
+
+                nx = x + step
+                below = y + 1 < height
+                for c in range(3):
+                    if c == 0:
+                        err = r - np.int32(palette[idx, 0])
+                    elif c == 1:
+                        err = g - np.int32(palette[idx, 1])
+                    else:
+                        err = b - np.int32(palette[idx, 2])
+                    if 0 <= nx < width:
+                        work[y, nx, c] += (err * 7) >> 4
+                    if below:
+                        px = x - step
+                        if 0 <= px < width:
+                            work[y + 1, px, c] += (err * 3) >> 4
+                        work[y + 1, x, c] += (err * 5) >> 4
+                        if 0 <= nx < width:
+                            work[y + 1, nx, c] += err >> 4
+                x = nx
+        return out
+
+    # numba's parallel threading layer is initialized by whichever thread
+    # first launches a parallel=True kernel; if that happens inside the
+    # worker QThread, interpreter shutdown deadlocks in Py_Finalize.
+    # This module is imported on the GUI thread, so fire one tiny launch
+    # here to pin the thread pool to the main thread.
+    _warm = np.zeros((1, 1, 3), dtype=np.uint8)
+    blend_series(_warm, _warm, np.empty((1, 1, 1, 3), dtype=np.uint8),
+                 np.zeros(1, dtype=np.int32))
+    del _warm
+
+
+class EnhancedGifCreatorThread(QThread):
+    """Persistent worker that renders GifJobs pulled from a queue
+
+    One long-lived thread serves every Generate click, so thread startup
+    and the numba JIT warmup are paid once.
+    """
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = queue.Queue()
+
+    def submit(self, job):
+        """Enqueue a job; the worker picks it up when idle"""
+        self.jobs.put(job)
+
+    def stop(self):
+        """Ask the worker loop to exit after the current job"""
+        self.jobs.put(None)
+
+    def run(self):
+        creator = GifFadeCreator()
+        creator.progress_callback = self.progress.emit
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+            try:
+                target_size = None if job.preserve_quality else (1920, 1080)
+
+                creator.create_fade_gif(
+                    job.image_paths,
+                    job.output_path,
+                    fade_steps=job.fade_steps,
+                    hold_duration=job.hold_duration,
+                    fade_duration=job.fade_duration,
+                    target_size=target_size,
+                    preserve_quality=job.preserve_quality,
+                    quality=job.quality,
+                    resampling_method=job.resampling_method,
+                    crop_area=job.crop_area,
+                    dither_method=job.dither_method,
+                    sharpen_strength=job.sharpen_strength,
+                    quantization_method=job.quantization_method
+                )
+
+                self.finished.emit(job.output_path)
+            except Exception as e:
+                self.error.emit(str(e))
+
+
+class GifFadeCreator:
+    # Prepared (decoded, cropped, sharpened, resized) frames from earlier
+    # runs, keyed by (path, mtime_ns, target_size, crop, sharpen, filter).
+    # Class-level so "tweak the timing, hit Generate again" re-renders
+    # skip the whole load+preprocess+resize phase.
+    _prepared_cache = {}
+    _PREPARED_CACHE_LIMIT = 32
+
+    def __init__(self):
+        self.progress_callback = None
+        self._last_progress = -1
+
+    def report_progress(self, percent):
+        """Forward progress only when the integer percent actually changes.
+
+        Each callback is a cross-thread Qt signal; emitting once per frame
+        floods the event queue for no visible benefit.
+        """
+        if self.progress_callback and percent != self._last_progress:
+            self._last_progress = percent
+            self.progress_callback(percent)
+
+    def get_resampling_filter(self, method_name):
+        """Get PIL resampling filter from method name"""
+        return RESAMPLING_FILTERS.get(method_name, Image.Resampling.LANCZOS)
+
+    def get_quantization_method(self, method_name):
+        """Get PIL quantization method from method name"""
+        return QUANTIZATION_METHODS.get(method_name, Image.Quantize.MEDIANCUT)
+
+
+    def resize_images_to_match(self, images, target_size=None, preserve_quality=False, resampling_filter=Image.Resampling.LANCZOS):
+        """Enhanced resize with quality preservation options"""
+        if preserve_quality:
+            # Find the largest dimensions among all images
+            max_width = max(img.size[0] for img in images)
+            max_height = max(img.size[1] for img in images)
+            target_size = (max_width, max_height)
+        elif target_size is None:
+            target_size = (1920, 1080)
+
+        # Common case: a batch of same-resolution sources already at the
+        # target geometry - nothing to scale, letterbox or paste
+        if all(img.size == target_size for img in images):
+            return list(images)
+
+        target_width, target_height = target_size
+        resized_images = []
+
+        for img in images:
+            if preserve_quality and img.size == target_size:
+                # No resize needed, keep original
+                resized_images.append(img)
+                continue
+
+            # Calculate scaling
+            img_width, img_height = img.size
+            width_ratio = target_width / img_width
+            height_ratio = target_height / img_height
+            scale_ratio = min(width_ratio, height_ratio)
+
+            new_width = int(img_width * scale_ratio)
+            new_height = int(img_height * scale_ratio)
+
+            # Use multi-stage resize for better quality
+            img_resized = self.multi_stage_resize(img, (new_width, new_height), resampling_filter)
+
+            # Create canvas; white letterbox for RGB matches the white
+            # background the quantizer composites transparency onto
+            if img.mode == 'RGBA':
+                canvas = Image.new('RGBA', target_size, (0, 0, 0, 0))
+            else:
+                canvas = Image.new('RGB', target_size, (255, 255, 255))
+            x_offset = (target_width - new_width) // 2
+            y_offset = (target_height - new_height) // 2
+            canvas.paste(img_resized, (x_offset, y_offset))
+
+            resized_images.append(canvas)
+
+        return resized_images
+
+
+    def create_fade_transition(self, image1, image2, fade_steps=10):
+        """Yield fade transition frames between two images"""
+        # Inputs come from resize_images_to_match and already share one
+        # mode (RGB, or RGBA when a source has alpha); converting here
+        # would just copy both buffers
+        # Identical endpoints (the same image object repeated): every fade
+        # frame equals the hold frame, and the downstream stream collapses
+        # repeated objects into a longer delay, so no blending at all
+        if image1 is image2:
+            for _ in range(max(fade_steps - 2, 0)):
+                yield image1
+            return
+
+        img1 = image1
+        img2 = image2
+        mode = img1.mode
+
+        # 8.8 fixed-point blend ramp, one factor per frame, computed in a
+        # single shot instead of re-branching and dividing every step.
+        # The endpoints (alpha=0 and alpha=1) are exact copies of the hold
+        # frames on either side, so only intermediate steps are blended -
+        # the holds themselves serve as the endpoints.
+        alphas = np.linspace(0, 256, max(fade_steps, 2)).round().astype(np.int32)[1:-1]
+        n_frames = alphas.shape[0]
+        if n_frames == 0:
+            return
+
+        # All fade frames for this transition live in one contiguous
+        # uint8[N,H,W,C] buffer: one allocation, linear stores, and no
+        # per-frame Python object overhead until the PIL wrap at the end
+        if HAS_CUDA and img1.size[0] * img1.size[1] >= GPU_MIN_PIXELS:
+            # Upload both endpoints once, blend every frame on the GPU,
+            # and copy the whole series back in a single transfer
+            g1 = cupy.asarray(np.asarray(img1, dtype=np.int16))
+            diff = cupy.asarray(np.asarray(img2, dtype=np.int16)) - g1
+            gpu_out = cupy.empty((n_frames,) + g1.shape, dtype=cupy.uint8)
+            for k, alpha_q in enumerate(alphas):
+                gpu_out[k] = g1 + ((diff * int(alpha_q)) >> 8)
+            out = cupy.asnumpy(gpu_out)
+        elif HAS_NUMBA:
+            # Single parallel pass over pixels - no per-step temporaries
+            a1 = np.ascontiguousarray(img1)
+            a2 = np.ascontiguousarray(img2)
+            out = np.empty((n_frames,) + a1.shape, dtype=np.uint8)
+            blend_series(a1, a2, out, alphas)
+        else:
+            # Convert both images to NumPy once and blend with fixed-point
+            # math instead of calling Image.blend per step (which re-reads
+            # both buffers and allocates a fresh image every iteration).
+            # NumPy's integer ufuncs already run many lanes per instruction;
+            # routing them through one reused int32 scratch buffer keeps the
+            # inner loop free of per-frame allocations as well.
+            a1 = np.ascontiguousarray(img1).astype(np.int32)
+            diff = np.ascontiguousarray(img2).astype(np.int32) - a1
+            scratch = np.empty_like(diff)
+            out = np.empty((n_frames,) + a1.shape, dtype=np.uint8)
+            for k, alpha_q in enumerate(alphas):
+                np.multiply(diff, alpha_q, out=scratch)
+                np.right_shift(scratch, 8, out=scratch)
+                np.add(scratch, a1, out=scratch)
+                # Assigning into the slice casts in place, skipping a
+                # separate astype(uint8) copy per frame
+                out[k] = scratch
+
+        # Wrap each slice lazily as the consumer pulls it, so downstream
+        # quantization can release frames while later ones are unused
+        for k in range(n_frames):
+            yield Image.fromarray(out[k], mode)
+
+    def create_fade_gif(self, image_paths, output_path, fade_steps=15, hold_duration=500,
+                   fade_duration=50, loop=0, target_size=None, preserve_quality=False,
+                   quality=95, resampling_method="LANCZOS (Best)", crop_area=None,
+                   dither_method="Floyd-Steinberg (Best)", sharpen_strength=0,
+                   quantization_method="Median Cut (Best)"):
+
+        """Enhanced GIF/WebP creation with quality and crop options"""
+
+        self._last_progress = -1
+
+        # Animated WebP is true-color: the whole 256-color quantization
+        # stage is skipped and frames are saved as-is
+        save_webp = str(output_path).lower().endswith('.webp')
+
+
+        # Load images
+        images = []
+        total_steps = len(image_paths) * 2
+        current_step = 0
+
+        # preserve_quality target size depends on the whole batch, so only
+        # fixed-target runs are cacheable per source file
+        cache_target = None if preserve_quality else (target_size or (1920, 1080))
+        cache_keys = []
+
+        def load_one(path):
+            """Open, normalize, color-manage, crop and sharpen one source"""
+            # Let open() raise for missing files instead of stat-ing first;
+            # the context manager releases the descriptor deterministically
+            try:
+                with Image.open(path) as img:
+                    img.load()
+            except (FileNotFoundError, UnidentifiedImageError):
+                # Skip unreadable inputs, matching the old exists() check
+                return None
+
+            # Crop first so every later pass (mode conversion, ICC
+            # transform, sharpen) only touches the cropped region;
+            # crop() carries img.info, so the ICC profile survives
+            if crop_area:
+                img = self.crop_image(img, crop_area)
+
+            # Keep RGB sources (JPEGs etc.) as RGB - promoting to RGBA
+            # adds a channel's worth of memory traffic through resize
+            # and blend that is flattened away again at quantization
+            if img.mode == 'P' and 'transparency' in img.info:
+                img = img.convert('RGBA')
+            elif img.mode not in ('RGB', 'RGBA'):
+                img = img.convert('RGB')
+
+            # Apply color space preservation
+            img = self.preserve_color_space(img)
+
+            # Apply sharpening if enabled
+            if sharpen_strength > 0:
+                img = self.apply_sharpening(img, sharpen_strength)
+
+            return img
+
+        # Resolve cache hits first, then decode the misses in parallel -
+        # decode, convert, crop and sharpen all run in Pillow C code with
+        # the GIL released, so they scale across cores
+        jobs = []  # (cache_key, prepared image or None to load)
+        for path in image_paths:
+            cache_key = None
+            if cache_target is not None:
+                try:
+                    cache_key = (path, os.stat(path).st_mtime_ns, cache_target,
+                                 crop_area, sharpen_strength, resampling_method)
+                except OSError:
+                    continue
+                cached = self._prepared_cache.get(cache_key)
+                if cached is not None:
+                    jobs.append((None, cached, path))  # final, nothing to store
+                    continue
+            jobs.append((cache_key, None, path))
+
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            fresh = executor.map(load_one, [path for _, prepared, path in jobs if prepared is None])
+            for cache_key, prepared, path in jobs:
+                if prepared is None:
+                    prepared = next(fresh)
+                    if prepared is None:
+                        continue
+                else:
+                    cache_key = None
+                images.append(prepared)
+                cache_keys.append(cache_key)
+                current_step += 1
+                self.report_progress(int((current_step / total_steps) * 50))
+
+        if len(images) < 2:
+            raise ValueError("Need at least 2 images to create transitions")
+
+        # Unify modes: promote to RGBA only when some source actually has
+        # alpha, otherwise the whole pipeline stays 3-channel
+        if any(img.mode == 'RGBA' for img in images):
+            images = [img.convert('RGBA') if img.mode != 'RGBA' else img for img in images]
+
+        # Resize images with quality settings
+        resampling_filter = self.get_resampling_filter(resampling_method)
+        images = self.resize_images_to_match(images, target_size, preserve_quality, resampling_filter)
+
+        # Remember the finished frames for the next run over the same files
+        if cache_target is not None:
+            for cache_key, final in zip(cache_keys, images):
+                if cache_key is not None:
+                    self._prepared_cache[cache_key] = final
+            while len(self._prepared_cache) > self._PREPARED_CACHE_LIMIT:
+                self._prepared_cache.pop(next(iter(self._prepared_cache)))
+
+        # Stream frames through quantization: each fade frame is generated,
+        # quantized, and its RGBA buffer dropped in small windows, instead
+        # of holding every full-resolution frame for the whole run. Each
+        # hold stays a single frame whose GIF delay is hold_duration, and
+        # repeated frame objects still collapse into a longer delay.
+        def frame_stream():
+            def steps():
+                for i in range(len(images)):
+                    yield images[i], hold_duration
+                    if i < len(images) - 1:
+                        fade_frames = self.create_fade_transition(images[i], images[i + 1], fade_steps)
+                        for fade_frame in fade_frames:
+                            yield fade_frame, fade_duration
+                    self.report_progress(int(50 + ((i + 1) / len(images)) * 50))
+
+            pending_frame = None
+            pending_duration = 0
+            for frame, duration in steps():
+                if frame is pending_frame:
+                    pending_duration += duration
+                    continue
+                if pending_frame is not None:
+                    yield pending_frame, pending_duration
+                pending_frame, pending_duration = frame, duration
+            if pending_frame is not None:
+                yield pending_frame, pending_duration
+
+        # Use enhanced quantization
+        dither_filter = self.get_dither_method(dither_method)
+        quantize_filter = self.get_quantization_method(quantization_method)
+        total_frames = len(images) + (len(images) - 1) * fade_steps
+        use_palette = preserve_quality and not save_webp
+        rgb_frames, durations = self.enhanced_quantization(
+            frame_stream(), use_palette,
+            dither_filter, quantize_filter, expected_frames=total_frames,
+            palette_source=self.build_palette_source(images) if use_palette else None,
+            memo_ids=frozenset(id(img) for img in images))
+
+
+        if save_webp:
+            rgb_frames[0].save(
+                output_path,
+                format='WEBP',
+                save_all=True,
+                append_images=rgb_frames[1:],
+                duration=durations,
+                loop=loop,
+                quality=quality,
+                method=4
+            )
+            return
+
+        # Save GIF - prefer libvips (libimagequant palette + interframe
+        # transparency, much faster LZW input) when pyvips is installed
+        if HAS_PYVIPS:
+            try:
+                self.save_gif_pyvips(rgb_frames, durations, output_path, loop)
+                return
+            except Exception:
+                pass  # Fall back to the Pillow encoder
+
+        # Save GIF with custom quality
+        rgb_frames[0].save(
+            output_path,
+            save_all=True,
+            append_images=rgb_frames[1:],
+            duration=durations,
+            loop=loop,
+            # Keep the previous frame in place so Pillow's bounding-box
+            # differ encodes only the changed region of each fade frame;
+            # disposal=2 forced a full clear and disabled delta encoding
+            disposal=1,
+            # optimize re-runs the LZW pass twice for marginal gains
+            optimize=False
+        )
+
+    def save_gif_pyvips(self, frames, durations, output_path, loop=0):
+        """Encode the GIF with libvips' gifsave (fast quantizer + interframe delta)"""
+        width, height = frames[0].size
+
+        # Stack frames vertically into one tall image; page-height tells
+        # libvips where each animation frame starts. Frames are written
+        # straight into the preallocated staging buffer one at a time so
+        # no second concatenated copy of the animation exists.
+        data = np.empty((height * len(frames), width, 3), dtype=np.uint8)
+        for i, frame in enumerate(frames):
+            if frame.mode != 'RGB':
+                frame = frame.convert('RGB')
+            data[i * height:(i + 1) * height] = np.asarray(frame)
+        # new_from_memory takes any buffer-protocol object, so hand it the
+        # array itself rather than a tobytes() duplicate; pyvips only keeps
+        # a reference, so data must stay alive until gifsave returns (it
+        # does: it is a local spanning the call)
+        vips_image = pyvips.Image.new_from_memory(
+            data, width, height * len(frames), 3, 'uchar'
+        ).copy()
+        vips_image.set_type(pyvips.GValue.gint_type, 'page-height', height)
+        vips_image.set_type(pyvips.GValue.array_int_type, 'delay', list(durations))
+        vips_image.set_type(pyvips.GValue.gint_type, 'loop', loop)
+
+        vips_image.gifsave(output_path, dither=1.0, effort=7, interframe_maxerror=8)
+
+
+    def crop_image(self, img, crop_area):
+        """Crop image to specified area (left, top, right, bottom)"""
+        return img.crop(crop_area)
+
+    def get_dither_method(self, method_name):
+        """Get PIL dithering method"""
+        return DITHER_METHODS.get(method_name, Image.Dither.FLOYDSTEINBERG)
+
+    def flatten_to_rgb(self, frame):
+        """Flatten a frame to RGB, compositing over white only when needed"""
+        if frame.mode == 'RGB':
+            return frame
+        if frame.mode != 'RGBA':
+            return frame.convert('RGB')
+
+        arr = np.asarray(frame)
+        alpha = arr[..., 3]
+        if alpha.min() == 255:
+            # Fully opaque (the usual case for blended fade frames) -
+            # just drop the alpha plane, no compositing required
+            return Image.fromarray(arr[..., :3], 'RGB')
+
+        # Vectorized composite over a white background in one pass instead
+        # of Image.new + paste(mask=...) per frame
+        a = alpha[..., None].astype(np.uint16)
+        rgb = ((arr[..., :3].astype(np.uint16) * a + 255 * (255 - a)) // 255).astype(np.uint8)
+        return Image.fromarray(rgb, 'RGB')
+
+    def build_palette_source(self, images, thumb_size=(256, 256)):
+        """Compose reduced keyframes side by side as palette-building input.
+
+        Palette statistics don't need full resolution; a strip of small
+        thumbnails lets one quantize call see the colors of every source
+        image, which also keeps the palette stable across transitions.
+        """
+        thumb_w, thumb_h = thumb_size
+        strip = Image.new('RGB', (thumb_w * len(images), thumb_h))
+        for i, img in enumerate(images):
+            thumb = self.flatten_to_rgb(img).resize(thumb_size, Image.Resampling.BILINEAR)
+            strip.paste(thumb, (i * thumb_w, 0))
+        return strip
+
+    def build_palette_lut(self, palette_img):
+        """Map 5-bit RGB bins to their nearest palette index, brute-force.
+
+        Built once per palette; the JIT dither then resolves every pixel
+        with a single table lookup instead of a 256-entry search.
+        """
+        raw = (palette_img.getpalette() or [])[:768]
+        raw += [0] * (768 - len(raw))
+        palette_rgb = np.array(raw, dtype=np.int16).reshape(256, 3)
+
+        bin_centers = (np.arange(32, dtype=np.int32) << 3) + 4
+        grid = np.stack(
+            np.meshgrid(bin_centers, bin_centers, bin_centers, indexing='ij'),
+            axis=-1
+        ).reshape(-1, 3)
+        distances = ((grid[:, None, :] - palette_rgb[None, :, :].astype(np.int32)) ** 2).sum(axis=-1)
+        lut = distances.argmin(axis=1).astype(np.uint8).reshape(32, 32, 32)
+        return palette_rgb, lut
+
+    def enhanced_quantization(self, frame_stream, preserve_quality=False, dither_method=Image.Dither.FLOYDSTEINBERG, quantize_method=Image.Quantize.MEDIANCUT, expected_frames=0, palette_source=None, memo_ids=frozenset()):
+        """Quantize a stream of (frame, duration) pairs for GIF output.
+
+        The stream is consumed in small windows so only a handful of
+        full-resolution RGBA frames are alive at any time; outputs are
+        palettized (quality mode) or flat RGB frames. expected_frames, when
+        known, presizes the output containers so they are filled by index
+        instead of grown by repeated appends.
+        """
+        out_frames = [None] * expected_frames
+        durations = [0] * expected_frames
+        count = 0
+        palette = None
+        palette_rgb = None
+        palette_lut = None
+
+        # Hold frames can recur non-consecutively (e.g. the same cached
+        # source added twice); quantize each distinct one only once. Only
+        # ids from memo_ids are memoized - caching one-shot fade frames
+        # would pin their transition buffers in memory for nothing.
+        quantized_memo = {}
+
+        def process_frame(frame):
+            memo_key = id(frame) if id(frame) in memo_ids else None
+            if memo_key is not None and memo_key in quantized_memo:
+                return quantized_memo[memo_key]
+            frame = self.flatten_to_rgb(frame)
+            if preserve_quality:
+                # Consecutive fade frames share almost the same color
+                # distribution, so the palette is derived once and every
+                # frame only pays for the dithered mapping
+                if palette_lut is not None:
+                    # JIT serpentine error diffusion with LUT palette
+                    # lookups instead of Pillow's per-pixel search
+                    indices = fs_dither(np.asarray(frame), palette_rgb, palette_lut)
+                    result = Image.fromarray(indices, 'P')
+                    result.putpalette(palette.getpalette())
+                else:
+                    result = frame.quantize(palette=palette, dither=dither_method)
+            else:
+                result = frame
+            if memo_key is not None:
+                quantized_memo[memo_key] = result
+            return result
+
+        frame_stream = iter(frame_stream)
+        window = max(2, (os.cpu_count() or 2) * 2)
+
+        # Palette mapping per frame is independent and releases the GIL in
+        # Pillow's C code, so shard each window across cores
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+            while True:
+                batch = list(itertools.islice(frame_stream, window))
+                if not batch:
+                    break
+                if preserve_quality and palette is None:
+                    source = palette_source if palette_source is not None else self.flatten_to_rgb(batch[0][0])
+                    palette = source.quantize(colors=256, method=quantize_method)
+                    if HAS_NUMBA and dither_method == Image.Dither.FLOYDSTEINBERG:
+                        palette_rgb, palette_lut = self.build_palette_lut(palette)
+                for (_, duration), processed in zip(batch, executor.map(process_frame, [f for f, _ in batch])):
+                    if count < expected_frames:
+                        out_frames[count] = processed
+                        durations[count] = duration
+                    else:
+                        out_frames.append(processed)
+                        durations.append(duration)
+                    count += 1
+
+        # Merged repeats make the stream shorter than the upper bound
+        del out_frames[count:]
+        del durations[count:]
+        return out_frames, durations
+
+
+    def multi_stage_resize(self, img, target_size, resampling_filter):
+        """Single filtered resize (kept for API compatibility).
+
+        Pillow's resize has done proper antialiased filtering for years,
+        so staged resizing no longer improves quality - it only re-walks
+        the full buffer per stage. reducing_gap=2.0 performs the same box
+        pre-reduction internally for large downscales.
+        """
+        return img.resize(target_size, resampling_filter, reducing_gap=2.0)
+
+    def apply_sharpening(self, img, strength=1.0):
+        """Apply unsharp mask for crisper images"""
+        if strength == 0:
+            return img
+
+        # Apply unsharp mask
+        sharpened = img.filter(ImageFilter.UnsharpMask(
+            radius=1.0 * strength,
+            percent=int(100 * strength),
+            threshold=3
+        ))
+        return sharpened
+
+    def preserve_color_space(self, img):
+        """Preserve original color space information"""
+        # Check if image has color profile
+        if hasattr(img, 'info') and 'icc_profile' in img.info:
+            # Preserve ICC profile
+            profile = img.info['icc_profile']
+            # Apply profile-aware conversion if needed
+            try:
+                profile_obj = ImageCms.ImageCmsProfile(io.BytesIO(profile))
+                # Most modern sources (phone photos, screenshots) are
+                # already tagged sRGB - the full-image LUT transform would
+                # be an expensive no-op, so skip it
+                description = ImageCms.getProfileDescription(profile_obj).strip()
+                if 'sRGB' in description:
+                    return img
+                # Convert to sRGB for web display while preserving quality
+                img = ImageCms.profileToProfile(img, profile_obj,
+                                              ImageCms.createProfile('sRGB'))
+            except:
+                pass  # Fall back to standard conversion
+
+        return img